@@ -5,15 +5,26 @@ Power Switch Web Application
 A Flask web app for electrical plan recommendations based on consumption data.
 """
 
+import atexit
+import io
+import logging
 import os
 import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, stream_template, request, redirect, url_for, flash, get_flashed_messages, jsonify, send_from_directory, Response, stream_with_context
+from flask_compress import Compress
+from jinja2.utils import htmlsafe_json_dumps
 from werkzeug.utils import secure_filename
 from src.consumption_parser import parse_consumption_file, extract_customer_info
 from src.plan_recommender import PlanRecommender
-from src.database import init_db, log_customer_analysis, get_analysis_stats, get_recent_analyses, backup_database, restore_database
-import tempfile
+from src.database import init_db, log_customer_analyses, get_analysis_stats, get_recent_analyses, iter_backup_json, restore_database
+import queue
 import shutil
+import threading
+import time
+from functools import lru_cache
+
+# Parser progress is logged at INFO; its per-line diagnostics stay off at DEBUG
+logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
@@ -22,9 +33,25 @@ app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-product
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'csv'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+STATIC_MAX_AGE = 7 * 24 * 60 * 60  # Browser cache lifetime for static assets (1 week)
+CRAWLER_FILES_MAX_AGE = 24 * 60 * 60  # Browser cache lifetime for sitemap.xml/robots.txt (1 day)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+app.config['SAVE_UPLOADS'] = os.environ.get('SAVE_UPLOADS', '').lower() in ('1', 'true')  # Keep uploads on disk for debugging
+
+# Response compression (results pages embed repetitive hourly JSON that compresses well).
+# Streamed responses are compressed chunk by chunk (Flask-Compress >= 1.21) with zstd,
+# br or deflate only; gzip is only offered for buffered responses
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'text/css', 'application/javascript']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+# Electrical plans are static, so load them once and share them across requests
+PLANS_FILE = 'electrical_plans.csv'
+PLANS_DF = pd.read_csv(PLANS_FILE)
 
 # Create upload directory if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -32,6 +59,63 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # Initialize database
 init_db(app)
 
+# Analyses are queued and written in batches by a background thread, off the response path
+LOG_QUEUE = queue.Queue()
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+LOG_SHUTDOWN_TIMEOUT = 10  # seconds to wait at exit for queued analyses to be written
+_LOG_STOP = object()  # Queued at exit to make the worker flush its batch and return
+
+def _analysis_log_worker():
+    """Drain LOG_QUEUE, inserting up to LOG_BATCH_SIZE analyses every LOG_FLUSH_INTERVAL."""
+    while True:
+        analyses = [LOG_QUEUE.get()]
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        while len(analyses) < LOG_BATCH_SIZE and analyses[-1] is not _LOG_STOP:
+            try:
+                analyses.append(LOG_QUEUE.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        stopping = analyses[-1] is _LOG_STOP
+        if stopping:
+            analyses.pop()
+        with app.app_context():
+            log_customer_analyses(analyses)
+        if stopping:
+            return
+
+LOG_WORKER = threading.Thread(target=_analysis_log_worker, name='analysis-log', daemon=True)
+LOG_WORKER.start()
+
+@atexit.register
+def _flush_analysis_log():
+    """Write every analysis still queued when the process exits, so shutdown does not lose them."""
+    LOG_QUEUE.put(_LOG_STOP)
+    LOG_WORKER.join(timeout=LOG_SHUTDOWN_TIMEOUT)
+    
+    # Anything left (the worker is stuck or gone) is written directly
+    remaining = []
+    while True:
+        try:
+            analysis = LOG_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if analysis is not _LOG_STOP:
+            remaining.append(analysis)
+    if remaining:
+        with app.app_context():
+            log_customer_analyses(remaining)
+
+def stream_results(**context):
+    """
+    Stream results.html to the client while it renders instead of buffering the whole page.
+    
+    Flashed messages are popped up front so the session update goes out with the
+    response headers, before the body starts streaming.
+    """
+    get_flashed_messages(with_categories=True)
+    return stream_template('results.html', **context)
+
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -59,84 +143,104 @@ def upload_file():
         return redirect(url_for('index'))
     
     try:
-        # Save uploaded file
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        content = file.read()
+        
+        # Keep a copy of the uploaded file only when debugging
+        if app.config['SAVE_UPLOADS']:
+            with open(os.path.join(app.config['UPLOAD_FOLDER'], filename), 'wb') as out:
+                out.write(content)
         
         # Process the file
         flash('הקובץ הועלה בהצלחה! מעבד את הנתונים שלך...', 'info')
         
-        # Parse consumption data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='_cleaned.csv', delete=False) as temp_file:
-            cleaned_file_path = temp_file.name
+        # Extract customer information before parsing
+        customer_info = extract_customer_info(io.BytesIO(content), filename)
         
-        try:
-            # Extract customer information before parsing
-            customer_info = extract_customer_info(filepath)
-            
-            parse_consumption_file(filepath, cleaned_file_path)
-            
-            # Generate recommendations
-            plans_file = 'electrical_plans.csv'
-            recommender = PlanRecommender(cleaned_file_path, plans_file)
-            recommender.load_data()
-            recommender.identify_active_months()
-            
-            if not recommender.active_months:
-                flash('לא נמצאו חודשים פעילים בנתונים שלך. אנא בדוק את קובץ הצריכה.', 'error')
-                return redirect(url_for('index'))
-            
-            recommendations = recommender.generate_recommendations()
-            
-            # Get hourly consumption data for chart
-            hourly_data = recommender.get_hourly_consumption_data()
-            
-            # Convert to dict for template
-            recommendations_data = recommendations.to_dict('records')
-            
-            # Log the analysis (best recommendation)
-            if recommendations_data:
-                best_plan = recommendations_data[0]  # First recommendation is the best
-                try:
-                    log_customer_analysis(
-                        customer_name=customer_info.get('customer_name', 'Unknown'),
-                        meter_number=customer_info.get('meter_number'),
-                        selected_provider=best_plan.get('provider', 'Unknown'),
-                        selected_plan=best_plan.get('plan_name', 'Unknown'),
-                        monthly_savings_nis=float(best_plan.get('monthly_savings_nis', 0)),
-                        monthly_savings_kwh=float(best_plan.get('monthly_savings_kwh', 0)) if best_plan.get('monthly_savings_kwh') else None,
-                        bill_savings_percentage=float(best_plan.get('bill_savings_percentage', 0)) if best_plan.get('bill_savings_percentage') else None,
-                        active_months_analyzed=len(recommender.active_months),
-                        filename=filename,
-                        ip_address=request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR')),
-                        user_agent=request.headers.get('User-Agent')
-                    )
-                except Exception as log_error:
-                    print(f"Failed to log analysis: {log_error}")
-            
-            # Clean up temporary files
-            os.unlink(filepath)
-            os.unlink(cleaned_file_path)
-            
-            return render_template('results.html', 
-                                 recommendations=recommendations_data,
-                                 active_months=len(recommender.active_months),
-                                 filename=filename,
-                                 hourly_data=hourly_data)
-            
-        except Exception as e:
-            # Clean up files on error
-            if os.path.exists(filepath):
-                os.unlink(filepath)
-            if os.path.exists(cleaned_file_path):
-                os.unlink(cleaned_file_path)
-            raise e
+        # Parse consumption data in memory
+        consumption_data = parse_consumption_file(io.BytesIO(content))
+        
+        # Generate recommendations
+        recommender = PlanRecommender.from_dataframe(consumption_data, plans_df=PLANS_DF)
+        recommender.load_data()
+        recommender.identify_active_months()
+        
+        if not recommender.active_months:
+            flash('לא נמצאו חודשים פעילים בנתונים שלך. אנא בדוק את קובץ הצריכה.', 'error')
+            return redirect(url_for('index'))
+        
+        recommendations = recommender.generate_recommendations()
+        
+        # Get hourly consumption data for chart, serialized once for the template's script
+        hourly_data = recommender.get_hourly_consumption_data()
+        hourly_json = htmlsafe_json_dumps(hourly_data, dumps=app.json.dumps) if hourly_data else None
+        
+        # Convert to dict for template
+        recommendations_data = recommendations.to_dict('records')
+        
+        # Log the analysis (best recommendation)
+        if recommendations_data:
+            best_plan = recommendations_data[0]  # First recommendation is the best
+            try:
+                LOG_QUEUE.put(dict(
+                    customer_name=customer_info.get('customer_name', 'Unknown'),
+                    meter_number=customer_info.get('meter_number'),
+                    selected_provider=best_plan.get('provider', 'Unknown'),
+                    selected_plan=best_plan.get('plan_name', 'Unknown'),
+                    monthly_savings_nis=float(best_plan.get('monthly_savings_nis', 0)),
+                    monthly_savings_kwh=float(best_plan.get('monthly_savings_kwh', 0)) if best_plan.get('monthly_savings_kwh') else None,
+                    bill_savings_percentage=float(best_plan.get('bill_savings_percentage', 0)) if best_plan.get('bill_savings_percentage') else None,
+                    active_months_analyzed=len(recommender.active_months),
+                    filename=filename,
+                    ip_address=request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR')),
+                    user_agent=request.headers.get('User-Agent')
+                ))
+            except Exception as log_error:
+                print(f"Failed to log analysis: {log_error}")
+        
+        return stream_results(recommendations=recommendations_data,
+                              active_months=len(recommender.active_months),
+                              filename=filename,
+                              hourly_json=hourly_json)
             
     except Exception as e:
         flash(f'שגיאה בעיבוד הקובץ: {str(e)}', 'error')
         return redirect(url_for('index'))
 
+@lru_cache(maxsize=1)
+def _compute_demo_payload(sample_file, mtime):
+    """
+    Run the recommendation pipeline on the demo file.
+    
+    The sample data never changes between requests, so the result is cached
+    and only recomputed when the file's modification time changes.
+    
+    Returns:
+        tuple: (customer_info, recommendations_data, active_months, hourly_json),
+            where active_months is 0 if no active months were found
+    """
+    # Extract customer information from demo file
+    customer_info = extract_customer_info(sample_file)
+    
+    # Generate recommendations using the sample file
+    recommender = PlanRecommender(sample_file, plans_df=PLANS_DF)
+    recommender.load_data()
+    recommender.identify_active_months()
+    
+    if not recommender.active_months:
+        return customer_info, [], 0, None
+    
+    recommendations = recommender.generate_recommendations()
+    
+    # Get hourly consumption data for chart, serialized once for the template's script
+    hourly_data = recommender.get_hourly_consumption_data()
+    hourly_json = htmlsafe_json_dumps(hourly_data, dumps=app.json.dumps) if hourly_data else None
+    
+    # Convert to dict for template
+    recommendations_data = recommendations.to_dict('records')
+    
+    return customer_info, recommendations_data, len(recommender.active_months), hourly_json
+
 @app.route('/demo')
 def demo():
     """Demo route using the sample CSV file in the repo."""
@@ -150,32 +254,19 @@ def demo():
         
         flash('משתמש בקובץ דוגמא! מעבד את הנתונים...', 'info')
         
-        # Extract customer information from demo file
-        customer_info = extract_customer_info(sample_file)
+        customer_info, recommendations_data, active_months, hourly_json = _compute_demo_payload(
+            sample_file, os.path.getmtime(sample_file)
+        )
         
-        # Generate recommendations using the sample file
-        plans_file = 'electrical_plans.csv'
-        recommender = PlanRecommender(sample_file, plans_file)
-        recommender.load_data()
-        recommender.identify_active_months()
-        
-        if not recommender.active_months:
+        if not active_months:
             flash('לא נמצאו חודשים פעילים בקובץ הדוגמא.', 'error')
             return redirect(url_for('index'))
         
-        recommendations = recommender.generate_recommendations()
-        
-        # Get hourly consumption data for chart
-        hourly_data = recommender.get_hourly_consumption_data()
-        
-        # Convert to dict for template
-        recommendations_data = recommendations.to_dict('records')
-        
         # Log the demo analysis (best recommendation)
         if recommendations_data:
             best_plan = recommendations_data[0]  # First recommendation is the best
             try:
-                log_customer_analysis(
+                LOG_QUEUE.put(dict(
                     customer_name=customer_info.get('customer_name', 'Demo User'),
                     meter_number=customer_info.get('meter_number'),
                     selected_provider=best_plan.get('provider', 'Unknown'),
@@ -183,19 +274,18 @@ def demo():
                     monthly_savings_nis=float(best_plan.get('monthly_savings_nis', 0)),
                     monthly_savings_kwh=float(best_plan.get('monthly_savings_kwh', 0)) if best_plan.get('monthly_savings_kwh') else None,
                     bill_savings_percentage=float(best_plan.get('bill_savings_percentage', 0)) if best_plan.get('bill_savings_percentage') else None,
-                    active_months_analyzed=len(recommender.active_months),
+                    active_months_analyzed=active_months,
                     filename='קובץ דוגמא',
                     ip_address=request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR')),
                     user_agent=request.headers.get('User-Agent')
-                )
+                ))
             except Exception as log_error:
                 print(f"Failed to log demo analysis: {log_error}")
         
-        return render_template('results.html', 
-                             recommendations=recommendations_data,
-                             active_months=len(recommender.active_months),
-                             filename='קובץ דוגמא',
-                             hourly_data=hourly_data)
+        return stream_results(recommendations=recommendations_data,
+                              active_months=active_months,
+                              filename='קובץ דוגמא',
+                              hourly_json=hourly_json)
         
     except Exception as e:
         flash(f'שגיאה בעיבוד קובץ הדוגמא: {str(e)}', 'error')
@@ -214,12 +304,12 @@ def static_files(filename):
 @app.route('/sitemap.xml')
 def sitemap():
     """Serve sitemap for search engines."""
-    return send_from_directory('static', 'sitemap.xml', mimetype='application/xml')
+    return send_from_directory('static', 'sitemap.xml', mimetype='application/xml', max_age=CRAWLER_FILES_MAX_AGE)
 
 @app.route('/robots.txt')
 def robots():
     """Serve robots.txt for search engines."""
-    return send_from_directory('static', 'robots.txt', mimetype='text/plain')
+    return send_from_directory('static', 'robots.txt', mimetype='text/plain', max_age=CRAWLER_FILES_MAX_AGE)
 
 @app.route('/admin/stats')
 def admin_stats():
@@ -265,11 +355,8 @@ def admin_customers_json():
 def admin_backup():
     """Create a backup of all customer data."""
     try:
-        backup_data = backup_database()
-        if backup_data:
-            return jsonify(backup_data)
-        else:
-            return jsonify({'error': 'Failed to create backup'}), 500
+        # Stream the backup so large tables are never materialized in memory
+        return Response(stream_with_context(iter_backup_json()), mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
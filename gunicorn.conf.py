@@ -0,0 +1,19 @@
+"""
+Gunicorn Configuration
+
+Loaded automatically by `gunicorn app:app` from the project root.
+Uploads block a worker for the whole save + parse + recommend cycle, so each
+worker runs several threads to keep serving other requests in the meantime.
+"""
+
+import os
+
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Keep preload_app off: app.py starts the analysis-log thread at import time, and a
+# thread started in the master before forking does not run in the workers. Each
+# worker imports the app itself, so it gets its own log thread and its atexit flush.
+preload_app = False
@@ -7,10 +7,10 @@ This script helps manage database migrations and backups.
 
 import os
 import sys
-import json
+import orjson
 from datetime import datetime
 from flask import Flask
-from src.database import init_db, backup_database, restore_database, db, CustomerAnalysis
+from src.database import init_db, write_backup_json, restore_database, db, CustomerAnalysis
 
 def create_app():
     """Create Flask app for database operations"""
@@ -34,20 +34,20 @@ def backup_to_file(filename=None):
     app = create_app()
     
     with app.app_context():
-        backup_data = backup_database()
-        if not backup_data:
-            print("Failed to create backup")
-            return False
-        
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"backup_{timestamp}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        # Records are streamed to disk as they are fetched
+        try:
+            with open(filename, 'wb') as f:
+                total_records = write_backup_json(f)
+        except Exception as e:
+            print(f"Failed to create backup: {e}")
+            return False
         
         print(f"Backup saved to {filename}")
-        print(f"Total records: {backup_data['total_records']}")
+        print(f"Total records: {total_records}")
         return True
 
 def restore_from_file(filename):
@@ -55,8 +55,8 @@ def restore_from_file(filename):
     app = create_app()
     
     try:
-        with open(filename, 'r') as f:
-            backup_data = json.load(f)
+        with open(filename, 'rb') as f:
+            backup_data = orjson.loads(f.read())
         
         with app.app_context():
             if restore_database(backup_data):
@@ -68,7 +68,7 @@ def restore_from_file(filename):
     except FileNotFoundError:
         print(f"Backup file {filename} not found")
         return False
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Invalid JSON in backup file {filename}")
         return False
 
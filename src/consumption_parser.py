@@ -10,154 +10,233 @@ This script processes electrical consumption CSV files by:
 """
 
 import csv
-import pandas as pd
 from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import itertools
+import logging
+import mmap
 import os
 import sys
 import re
 
-def parse_consumption_file(input_file_path, output_file_path=None):
+logger = logging.getLogger(__name__)
+
+# UTF-8 markers of the Hebrew data header line ("תאריך" = date, "צריכה" = consumption)
+DATE_HEADER_MARKER = 'תאריך'.encode('utf-8')
+CONSUMPTION_HEADER_MARKER = 'צריכה'.encode('utf-8')
+
+# Surrounding whitespace and quotes removed from extracted header values in a single strip
+# (only the ends are trimmed, so apostrophes inside names such as ג'ורג' are kept)
+_QUOTE_STRIP_CHARS = ' \t\r\n\f\v\xa0"\''
+
+# Number of leading lines extract_customer_info searches for customer details
+HEADER_SCAN_LINES = 20
+
+# Header patterns used by extract_customer_info, compiled once at import
+_METER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'מונה[:\s]*(\d+)',
+    r'Meter[:\s]*(\d+)',
+    r'מספר\s*מונה[:\s]*(\d+)',
+    r'Meter\s*Number[:\s]*(\d+)',
+    r'(\d{8,12})'  # 8-12 digit numbers (common meter number format)
+]]
+
+_ADDRESS_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'כתובת[:\s]*([^,\n]+)',
+    r'Address[:\s]*([^,\n]+)',
+    r'רחוב[:\s]*([^,\n]+)'
+]]
+
+_ACCOUNT_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'חשבון[:\s]*(\d+)',
+    r'Account[:\s]*(\d+)',
+    r'מספר\s*חשבון[:\s]*(\d+)',
+    r'Account\s*Number[:\s]*(\d+)'
+]]
+
+_DIGIT_RE = re.compile(r'\d')
+_ADDRESS_KEYWORD_RE = re.compile(r'כתובת|Address|רחוב', re.IGNORECASE)
+
+_FILENAME_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'meter_\d+_([^_]+)',
+    r'([^_\d]+)_\d+',
+    r'([a-zA-Zא-ת]+)'
+]]
+
+# Common Hebrew labels and placeholders that are not customer names
+_INVALID_NAMES = frozenset([
+    'לקוח', 'customer', 'name', 'שם', 'מנוי', 'בעל', 'חשבון',
+    'account', 'holder', 'user', 'משתמש', 'בעלים', 'owner',
+    'נ/א', 'n/a', 'null', 'none', 'empty', 'ריק', 'תאריך', 'date',
+    'שעה', 'time', 'צריכה', 'consumption', 'מונה', 'meter'
+])
+_INVALID_NAME_RE = re.compile('|'.join(map(re.escape, sorted(_INVALID_NAMES))))
+_NAME_LETTER_RE = re.compile(r'[א-תa-zA-Z]')
+_DATE_LIKE_RE = re.compile(r'\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}')
+_TIME_LIKE_RE = re.compile(r'\d{1,2}:\d{2}')
+
+def _read_bytes(input_file):
+    """Return the raw contents of a binary file-like object, or a read-only memory map of a file path."""
+    if hasattr(input_file, 'read'):
+        return input_file.read()
+    with open(input_file, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''  # Empty files cannot be mapped
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _read_header_lines(input_file, max_lines):
+    """Return up to max_lines decoded lines from the start of a file path or binary file-like object."""
+    if hasattr(input_file, 'read'):
+        return [line.decode('utf-8') for line in itertools.islice(input_file, max_lines)]
+    with open(input_file, 'rb') as file:
+        return [line.decode('utf-8') for line in itertools.islice(file, max_lines)]
+
+def _split_csv_line(line):
+    """Split a single CSV line into stripped cells using the C-implemented csv tokenizer."""
+    return [cell.strip().strip('"') for cell in next(csv.reader([line]), [])]
+
+def parse_consumption_file(input_file, output_file_path=None):
     """
     Parse the consumption CSV file and clean it up.
     
     Args:
-        input_file_path (str): Path to the input CSV file
+        input_file (str or file-like): Path to the input CSV file, or a binary file-like object
         output_file_path (str): Path for the output CSV file (optional)
     
     Returns:
-        str: Path to the cleaned output file
+        str or pd.DataFrame: Path to the cleaned output file, or the cleaned
+            DataFrame (timestamp, kwh_consumption) if no output path is given
     """
+    if isinstance(input_file, (str, os.PathLike)):
+        logger.info("Processing file: %s", input_file)
     
-    # If no output path specified, create one based on input filename
-    if output_file_path is None:
-        base_name = os.path.splitext(os.path.basename(input_file_path))[0]
-        output_file_path = os.path.join(os.path.dirname(input_file_path), f"{base_name}_cleaned.csv")
+    # Read (or memory-map) the file and find where the actual data starts
+    raw = _read_bytes(input_file)
     
-    print(f"Processing file: {input_file_path}")
-    
-    # Read the file and find where the actual data starts
-    with open(input_file_path, 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-    
-    # Find the line with Hebrew headers (contains "תאריך")
-    data_start_line = None
-    for i, line in enumerate(lines):
-        if 'תאריך' in line and 'צריכה' in line:
-            data_start_line = i + 2  # Skip the header line and the empty line after it
+    # Find the line with Hebrew headers (contains "תאריך") by scanning the raw bytes
+    header_end = None
+    marker = raw.find(DATE_HEADER_MARKER)
+    while marker != -1:
+        line_start = raw.rfind(b'\n', 0, marker) + 1
+        line_end = raw.find(b'\n', marker)
+        if line_end == -1:
+            line_end = len(raw)
+        if CONSUMPTION_HEADER_MARKER in raw[line_start:line_end]:
+            header_end = line_end + 1
             break
+        marker = raw.find(DATE_HEADER_MARKER, line_end)
     
-    if data_start_line is None:
+    if header_end is None:
         raise ValueError("Could not find the data start point in the CSV file")
     
-    print(f"Found data starting at line {data_start_line + 1}")
+    data_start_line = raw[:header_end].count(b'\n') + 1  # Skip the header line and the empty line after it
+    logger.info("Found data starting at line %d", data_start_line + 1)
     
-    # Extract only the data rows
-    data_lines = lines[data_start_line:]
+    # Read the data rows with Arrow's multithreaded CSV reader. The schema is fixed to
+    # three columns so it never depends on the first row's shape; rows with any other
+    # field count are handed to _collect_ragged_row, which keeps the first three fields
+    # of every row that has at least three
+    ragged_rows = []
+    skipped_rows = []
     
-    # Parse the data
-    consumption_data = []
+    def _collect_ragged_row(row):
+        cells = _split_csv_line(row.text)
+        if len(cells) >= 3:
+            ragged_rows.append(cells[:3])
+        else:
+            skipped_rows.append(row.text)
+        return 'skip'
     
-    for line_num, line in enumerate(data_lines, start=data_start_line + 1):
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Parse CSV line manually to handle quotes properly
-        try:
-            # Remove quotes and split by comma
-            parts = []
-            current_part = ""
-            in_quotes = False
-            
-            for char in line:
-                if char == '"':
-                    in_quotes = not in_quotes
-                elif char == ',' and not in_quotes:
-                    parts.append(current_part.strip())
-                    current_part = ""
-                else:
-                    current_part += char
-            
-            # Add the last part
-            parts.append(current_part.strip())
-            
-            if len(parts) >= 3:
-                date_str = parts[0].strip('"')
-                time_str = parts[1].strip('"')
-                consumption_str = parts[2].strip('"')
-                
-                # Skip empty or invalid rows
-                if not date_str or not time_str:
-                    continue
-                
-                # Parse consumption value
-                try:
-                    consumption = float(consumption_str) if consumption_str else 0.0
-                except ValueError:
-                    consumption = 0.0
-                
-                # Combine date and time into timestamp
-                try:
-                    # Parse date (DD/MM/YYYY format)
-                    date_parts = date_str.split('/')
-                    if len(date_parts) == 3:
-                        day, month, year = date_parts
-                        
-                        # Parse time (HH:MM format)
-                        time_parts = time_str.split(':')
-                        if len(time_parts) == 2:
-                            hour, minute = time_parts
-                            
-                            # Create datetime object
-                            dt = datetime(
-                                year=int(year),
-                                month=int(month),
-                                day=int(day),
-                                hour=int(hour),
-                                minute=int(minute)
-                            )
-                            
-                            # Format as ISO timestamp
-                            timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            
-                            consumption_data.append({
-                                'timestamp': timestamp,
-                                'kwh_consumption': consumption
-                            })
-                            
-                except (ValueError, IndexError) as e:
-                    print(f"Warning: Could not parse line {line_num}: {line.strip()}")
-                    continue
-                    
-        except Exception as e:
-            print(f"Warning: Error processing line {line_num}: {e}")
-            continue
+    table = pacsv.read_csv(
+        pa.BufferReader(pa.py_buffer(raw)[header_end:]),
+        read_options=pacsv.ReadOptions(
+            skip_rows=1,
+            column_names=['date', 'time', 'kwh']
+        ),
+        parse_options=pacsv.ParseOptions(
+            delimiter=',',
+            invalid_row_handler=_collect_ragged_row
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={'date': pa.string(), 'time': pa.string(), 'kwh': pa.string()},
+            strings_can_be_null=True
+        )
+    )
     
-    print(f"Processed {len(consumption_data)} data points")
+    if ragged_rows:
+        date_strs, time_strs, kwh_strs = zip(*ragged_rows)
+        table = pa.concat_tables([table, pa.table({
+            'date': pa.array([cell or None for cell in date_strs], pa.string()),
+            'time': pa.array([cell or None for cell in time_strs], pa.string()),
+            'kwh': pa.array([cell or None for cell in kwh_strs], pa.string())
+        })])
+    if skipped_rows:
+        logger.warning("Skipped %d lines with fewer than 3 fields", len(skipped_rows))
     
-    # Create DataFrame and save to CSV
-    df = pd.DataFrame(consumption_data)
+    # Skip empty or invalid rows
+    table = table.filter(pc.and_(pc.is_valid(table['date']), pc.is_valid(table['time'])))
     
-    # Sort by timestamp to ensure chronological order
-    df['timestamp_dt'] = pd.to_datetime(df['timestamp'])
-    df = df.sort_values('timestamp_dt').drop('timestamp_dt', axis=1)
+    # Combine date (DD/MM/YYYY) and time (HH:MM) into timestamp. Each distinct date and
+    # time string is parsed once and expanded back to the rows, since every reading
+    # of a day shares its date and every time of day repeats daily
+    dates = pc.dictionary_encode(pc.utf8_trim_whitespace(table['date']).combine_chunks())
+    times = pc.dictionary_encode(pc.utf8_trim_whitespace(table['time']).combine_chunks())
+    day_starts = pc.strptime(dates.dictionary, format='%d/%m/%Y', unit='s', error_is_null=True)
+    times_of_day = pc.subtract(
+        pc.strptime(times.dictionary, format='%H:%M', unit='s', error_is_null=True),
+        pa.scalar(datetime(1900, 1, 1), pa.timestamp('s'))
+    )
+    timestamps = pc.add(pc.take(day_starts, dates.indices), pc.take(times_of_day, times.indices))
+    
+    # Parse consumption value (non-numeric readings count as 0)
+    try:
+        kwh = pc.cast(table['kwh'], pa.float64())
+    except pa.ArrowInvalid:
+        kwh = pa.array(pd.to_numeric(table['kwh'].to_pandas(), errors='coerce'), pa.float64(), from_pandas=True)
     
-    # Save to CSV
-    df.to_csv(output_file_path, index=False)
+    table = pa.table({
+        'timestamp': timestamps,
+        'kwh_consumption': pc.fill_null(kwh, 0.0)
+    })
     
-    print(f"Cleaned data saved to: {output_file_path}")
-    print(f"Data range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-    print(f"Total consumption: {df['kwh_consumption'].sum():.2f} kWh")
-    print(f"Average consumption per reading: {df['kwh_consumption'].mean():.4f} kWh")
+    invalid_rows = table['timestamp'].null_count
+    if invalid_rows:
+        logger.warning("Could not parse %d lines", invalid_rows)
+    table = table.filter(pc.is_valid(table['timestamp']))
+    
+    logger.info("Processed %d data points", table.num_rows)
+    
+    # Sort by timestamp to ensure chronological order (Arrow's sort is stable)
+    table = table.sort_by('timestamp')
+    
+    # Summary statistics are only computed when they will actually be logged
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Data range: %s to %s", pc.min(table['timestamp']).as_py(), pc.max(table['timestamp']).as_py())
+        logger.info("Total consumption: %.2f kWh", pc.sum(table['kwh_consumption']).as_py())
+        logger.info("Average consumption per reading: %.4f kWh", pc.mean(table['kwh_consumption']).as_py())
+    
+    # Only the typed columns are converted; the raw date/time strings never become Python objects
+    if output_file_path is None:
+        return table.to_pandas()
+    
+    # Save to CSV with Arrow's batched writer (timestamps are formatted only on write)
+    pacsv.write_csv(table, output_file_path, write_options=pacsv.WriteOptions(batch_size=65536))
+    
+    logger.info("Cleaned data saved to: %s", output_file_path)
     
     return output_file_path
 
-def extract_customer_info(input_file_path):
+def extract_customer_info(input_file, filename=None):
     """
     Extract customer information from the meter CSV file header.
     
     Args:
-        input_file_path (str): Path to the input CSV file
+        input_file (str or file-like): Path to the input CSV file, or a binary file-like object
+        filename (str, optional): Original filename, used as a fallback source for the
+            customer name (defaults to the basename of input_file when it is a path)
     
     Returns:
         dict: Dictionary containing customer_name, meter_number, and other metadata
@@ -170,40 +249,28 @@ def extract_customer_info(input_file_path):
     }
     
     try:
-        with open(input_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+        # Only the header window is read (plus the 2 lines a name label can look ahead)
+        lines = _read_header_lines(input_file, HEADER_SCAN_LINES + 2)
         
         # Look through the first 20 lines for customer information
-        for i, line in enumerate(lines[:20]):
+        for i, line in enumerate(lines[:HEADER_SCAN_LINES]):
             line = line.strip()
             if not line:
                 continue
             
-            # Debug: print lines being analyzed
-            print(f"Analyzing line {i+1}: {line[:100]}...")
+            # Debug: log lines being analyzed
+            logger.debug("Analyzing line %d: %.100s...", i + 1, line)
             
             # Look for "שם לקוח" label first, then get name from 2 cells below (down)
             if 'שם לקוח' in line or 'שם המנוי' in line:
-                print(f"Found customer name label at line {i+1}")
+                logger.debug("Found customer name label at line %d", i + 1)
                 
                 # Parse the current line as CSV to find which cell contains the label
                 try:
                     # Split line by comma, handling quotes
-                    cells = []
-                    current_cell = ""
-                    in_quotes = False
-                    
-                    for char in line:
-                        if char == '"':
-                            in_quotes = not in_quotes
-                        elif char == ',' and not in_quotes:
-                            cells.append(current_cell.strip().strip('"'))
-                            current_cell = ""
-                        else:
-                            current_cell += char
-                    cells.append(current_cell.strip().strip('"'))
+                    cells = _split_csv_line(line)
                     
-                    print(f"Parsed cells: {cells}")
+                    logger.debug("Parsed cells: %s", cells)
                     
                     # Find which cell contains the label
                     label_cell_index = -1
@@ -213,7 +280,7 @@ def extract_customer_info(input_file_path):
                             break
                     
                     if label_cell_index >= 0:
-                        print(f"Label found in cell index: {label_cell_index}")
+                        logger.debug("Label found in cell index: %d", label_cell_index)
                         
                         # Look for name 2 ROWS below in the same column
                         potential_name = None
@@ -221,152 +288,101 @@ def extract_customer_info(input_file_path):
                         
                         if target_line_idx < len(lines):
                             target_line = lines[target_line_idx].strip()
-                            print(f"Looking for name in line {target_line_idx + 1}: {target_line[:100]}...")
+                            logger.debug("Looking for name in line %d: %.100s...", target_line_idx + 1, target_line)
                             
                             if target_line:
                                 # Parse target line cells
-                                target_cells = []
-                                current_cell = ""
-                                in_quotes = False
+                                target_cells = _split_csv_line(target_line)
                                 
-                                for char in target_line:
-                                    if char == '"':
-                                        in_quotes = not in_quotes
-                                    elif char == ',' and not in_quotes:
-                                        target_cells.append(current_cell.strip().strip('"'))
-                                        current_cell = ""
-                                    else:
-                                        current_cell += char
-                                target_cells.append(current_cell.strip().strip('"'))
-                                
-                                print(f"Target line cells: {target_cells}")
+                                logger.debug("Target line cells: %s", target_cells)
                                 
                                 # Get name from same column position
                                 if len(target_cells) > label_cell_index:
                                     potential_name = target_cells[label_cell_index].strip()
-                                    print(f"Found name 2 rows below: '{potential_name}'")
+                                    logger.debug("Found name 2 rows below: '%s'", potential_name)
                                 else:
-                                    print(f"Not enough cells in target line (need {label_cell_index + 1}, got {len(target_cells)})")
+                                    logger.debug("Not enough cells in target line (need %d, got %d)", label_cell_index + 1, len(target_cells))
                         
                         # Fallback: try 1 row below if 2 rows below doesn't work
                         if not potential_name and i + 1 < len(lines):
                             fallback_line = lines[i + 1].strip()
-                            print(f"Fallback: checking line {i + 2}: {fallback_line[:100]}...")
+                            logger.debug("Fallback: checking line %d: %.100s...", i + 2, fallback_line)
                             
                             if fallback_line:
-                                fallback_cells = []
-                                current_cell = ""
-                                in_quotes = False
-                                
-                                for char in fallback_line:
-                                    if char == '"':
-                                        in_quotes = not in_quotes
-                                    elif char == ',' and not in_quotes:
-                                        fallback_cells.append(current_cell.strip().strip('"'))
-                                        current_cell = ""
-                                    else:
-                                        current_cell += char
-                                fallback_cells.append(current_cell.strip().strip('"'))
+                                fallback_cells = _split_csv_line(fallback_line)
                                 
                                 if len(fallback_cells) > label_cell_index:
                                     potential_name = fallback_cells[label_cell_index].strip()
-                                    print(f"Found name 1 row below: '{potential_name}'")
+                                    logger.debug("Found name 1 row below: '%s'", potential_name)
                         
                         # Validate the potential name
                         if potential_name:
-                            name = potential_name.strip().strip('"').strip("'").strip()
+                            name = potential_name.strip(_QUOTE_STRIP_CHARS)
                             
-                            # Filter out common Hebrew labels and invalid names
-                            invalid_names = [
-                                'לקוח', 'customer', 'name', 'שם', 'מנוי', 'בעל', 'חשבון',
-                                'account', 'holder', 'user', 'משתמש', 'בעלים', 'owner',
-                                'נ/א', 'n/a', 'null', 'none', 'empty', 'ריק', 'תאריך', 'date',
-                                'שעה', 'time', 'צריכה', 'consumption', 'מונה', 'meter'
-                            ]
-                            
-                            # Check if name is valid
+                            # Check if name is valid (filtering out common Hebrew labels and invalid names)
                             if (name and 
                                 len(name) > 2 and 
                                 len(name) < 50 and  # Reasonable name length
                                 not name.isdigit() and 
-                                name.lower() not in invalid_names and
-                                not any(invalid in name.lower() for invalid in invalid_names) and
+                                name.lower() not in _INVALID_NAMES and
+                                not _INVALID_NAME_RE.search(name.lower()) and
                                 # Must contain at least one letter (Hebrew or English)
-                                re.search(r'[א-תa-zA-Z]', name) and
+                                _NAME_LETTER_RE.search(name) and
                                 # Should not be a date or time pattern
-                                not re.match(r'\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}', name) and
-                                not re.match(r'\d{1,2}:\d{2}', name)):
+                                not _DATE_LIKE_RE.match(name) and
+                                not _TIME_LIKE_RE.match(name)):
                                 
-                                print(f"Valid customer name found: '{name}'")
+                                logger.debug("Valid customer name found: '%s'", name)
                                 customer_info['customer_name'] = name
                                 break
                             else:
-                                print(f"Invalid name rejected: '{name}'")
+                                logger.debug("Invalid name rejected: '%s'", name)
                 
                 except Exception as e:
-                    print(f"Error parsing CSV line: {e}")
+                    logger.warning("Error parsing CSV line: %s", e)
                     continue
             
-            # Look for meter number patterns
-            meter_patterns = [
-                r'מונה[:\s]*(\d+)',
-                r'Meter[:\s]*(\d+)',
-                r'מספר\s*מונה[:\s]*(\d+)',
-                r'Meter\s*Number[:\s]*(\d+)',
-                r'(\d{8,12})'  # 8-12 digit numbers (common meter number format)
-            ]
+            # Cheap prefilters decide which pattern groups can match this line at all:
+            # every meter/account pattern needs a digit, every address pattern a keyword
+            has_digit = _DIGIT_RE.search(line) is not None
             
-            for pattern in meter_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    meter_num = match.group(1).strip()
-                    if meter_num and len(meter_num) >= 6:
-                        customer_info['meter_number'] = meter_num
-                        break
+            # Look for meter number patterns
+            if has_digit:
+                for pattern in _METER_PATTERNS:
+                    match = pattern.search(line)
+                    if match:
+                        meter_num = match.group(1).strip()
+                        if meter_num and len(meter_num) >= 6:
+                            customer_info['meter_number'] = meter_num
+                            break
             
             # Look for address patterns
-            address_patterns = [
-                r'כתובת[:\s]*([^,\n]+)',
-                r'Address[:\s]*([^,\n]+)',
-                r'רחוב[:\s]*([^,\n]+)'
-            ]
-            
-            for pattern in address_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    address = match.group(1).strip().strip('"').strip("'")
-                    if address and len(address) > 3:
-                        customer_info['address'] = address
-                        break
+            if _ADDRESS_KEYWORD_RE.search(line):
+                for pattern in _ADDRESS_PATTERNS:
+                    match = pattern.search(line)
+                    if match:
+                        address = match.group(1).strip(_QUOTE_STRIP_CHARS)
+                        if address and len(address) > 3:
+                            customer_info['address'] = address
+                            break
             
             # Look for account number patterns
-            account_patterns = [
-                r'חשבון[:\s]*(\d+)',
-                r'Account[:\s]*(\d+)',
-                r'מספר\s*חשבון[:\s]*(\d+)',
-                r'Account\s*Number[:\s]*(\d+)'
-            ]
-            
-            for pattern in account_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    account = match.group(1).strip()
-                    if account and len(account) >= 4:
-                        customer_info['account_number'] = account
-                        break
+            if has_digit:
+                for pattern in _ACCOUNT_PATTERNS:
+                    match = pattern.search(line)
+                    if match:
+                        account = match.group(1).strip()
+                        if account and len(account) >= 4:
+                            customer_info['account_number'] = account
+                            break
         
         # If no customer name found, try to extract from filename
-        if not customer_info['customer_name']:
-            filename = os.path.basename(input_file_path)
+        if filename is None and isinstance(input_file, (str, os.PathLike)):
+            filename = os.path.basename(input_file)
+        if not customer_info['customer_name'] and filename:
             # Look for patterns like "meter_12345_customer_name.csv"
-            filename_patterns = [
-                r'meter_\d+_([^_]+)',
-                r'([^_\d]+)_\d+',
-                r'([a-zA-Zא-ת]+)'
-            ]
-            
-            for pattern in filename_patterns:
-                match = re.search(pattern, filename, re.IGNORECASE)
+            for pattern in _FILENAME_PATTERNS:
+                match = pattern.search(filename)
                 if match:
                     name = match.group(1).strip().replace('_', ' ')
                     if name and len(name) > 2 and not name.lower() in ['meter', 'data', 'consumption', 'csv']:
@@ -377,18 +393,20 @@ def extract_customer_info(input_file_path):
         for key, value in customer_info.items():
             if value:
                 # Remove extra whitespace and quotes
-                cleaned = str(value).strip().strip('"').strip("'").strip()
+                cleaned = str(value).strip(_QUOTE_STRIP_CHARS)
                 customer_info[key] = cleaned if cleaned else None
         
-        print(f"Extracted customer info: {customer_info}")
+        logger.info("Extracted customer info: %s", customer_info)
         return customer_info
         
     except Exception as e:
-        print(f"Error extracting customer info: {e}")
+        logger.error("Error extracting customer info: %s", e)
         return customer_info
 
 def main():
     """Main function to run the parser from command line"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     if len(sys.argv) < 2:
         print("Usage: python consumption_parser.py <input_csv_file> [output_csv_file]")
         sys.exit(1)
@@ -400,6 +418,11 @@ def main():
         print(f"Error: Input file '{input_file}' not found")
         sys.exit(1)
     
+    # If no output path specified, create one based on input filename
+    if output_file is None:
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        output_file = os.path.join(os.path.dirname(input_file), f"{base_name}_cleaned.csv")
+    
     try:
         output_path = parse_consumption_file(input_file, output_file)
         print(f"\nSuccess! Cleaned file created at: {output_path}")
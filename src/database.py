@@ -7,7 +7,9 @@ This module defines the database models for logging customer analysis data.
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event, insert
 from datetime import datetime
+import orjson
 import os
 
 db = SQLAlchemy()
@@ -20,8 +22,8 @@ class CustomerAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     customer_name = db.Column(db.String(255), nullable=True)  # Extracted from meter file
     meter_number = db.Column(db.String(100), nullable=True)   # Meter ID if available
-    analysis_timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    selected_provider = db.Column(db.String(100), nullable=False)
+    analysis_timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)  # Recent analyses ordering
+    selected_provider = db.Column(db.String(100), nullable=False, index=True)  # Top providers grouping
     selected_plan = db.Column(db.String(200), nullable=False)
     monthly_savings_nis = db.Column(db.Float, nullable=False)
     monthly_savings_kwh = db.Column(db.Float, nullable=True)
@@ -52,6 +54,14 @@ class CustomerAnalysis(db.Model):
             'user_agent': self.user_agent
         }
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so local SQLite commits don't fsync the whole database each time"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
 def init_db(app):
     """Initialize database with Flask app"""
     # Configure database URL
@@ -73,8 +83,14 @@ def init_db(app):
     
     # Create tables (only if they don't exist)
     with app.app_context():
+        if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+            event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+        
         try:
             db.create_all()
+            # create_all skips existing tables entirely, so add any indexes they are missing
+            for index in CustomerAnalysis.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
             print("Database tables created successfully")
         except Exception as e:
             print(f"Database initialization note: {e}")
@@ -129,21 +145,56 @@ def log_customer_analysis(customer_name, meter_number, selected_provider, select
         print(f"Error logging customer analysis: {e}")
         return None
 
+# Compiled once and reused for every bulk write (analysis logging and restores)
+INSERT_ANALYSIS = insert(CustomerAnalysis)
+RESTORE_BATCH_SIZE = 1000
+BACKUP_BATCH_SIZE = 1000
+
+def log_customer_analyses(analyses):
+    """
+    Log a batch of customer analyses to the database with a single bulk INSERT
+    
+    Args:
+        analyses (list of dict): Column values per analysis, with the same keys
+            as the arguments of log_customer_analysis
+    
+    Returns:
+        int: Number of records written (0 on error)
+    """
+    if not analyses:
+        return 0
+    
+    try:
+        db.session.execute(INSERT_ANALYSIS, analyses)
+        db.session.commit()
+        
+        print(f"Logged {len(analyses)} customer analyses")
+        return len(analyses)
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error logging customer analyses: {e}")
+        return 0
+
 def get_analysis_stats():
     """Get basic statistics about logged analyses"""
     try:
-        total_analyses = CustomerAnalysis.query.count()
-        total_savings = db.session.query(db.func.sum(CustomerAnalysis.monthly_savings_nis)).scalar() or 0
-        avg_savings = db.session.query(db.func.avg(CustomerAnalysis.monthly_savings_nis)).scalar() or 0
-        
-        # Top providers
+        # One round-trip: the per-provider counts come back grouped, and window
+        # functions over those groups carry the table-wide totals on every row
+        provider_count = db.func.count(CustomerAnalysis.id)
         top_providers = db.session.query(
             CustomerAnalysis.selected_provider,
-            db.func.count(CustomerAnalysis.id).label('count')
+            provider_count.label('count'),
+            db.func.sum(provider_count).over().label('total_analyses'),
+            db.func.sum(db.func.sum(CustomerAnalysis.monthly_savings_nis)).over().label('total_savings')
         ).group_by(CustomerAnalysis.selected_provider).order_by(
-            db.func.count(CustomerAnalysis.id).desc()
+            provider_count.desc()
         ).limit(5).all()
         
+        total_analyses = int(top_providers[0].total_analyses) if top_providers else 0
+        total_savings = float(top_providers[0].total_savings or 0) if top_providers else 0
+        avg_savings = total_savings / total_analyses if total_analyses else 0
+        
         return {
             'total_analyses': total_analyses,
             'total_monthly_savings': round(total_savings, 2),
@@ -166,19 +217,78 @@ def get_recent_analyses(limit=50):
         print(f"Error getting recent analyses: {e}")
         return []
 
-def backup_database():
-    """Create a backup of all customer analysis data"""
+def iter_backup_records():
+    """Yield every analysis as a backup record, fetching rows in batches of BACKUP_BATCH_SIZE"""
+    for analysis in CustomerAnalysis.query.yield_per(BACKUP_BATCH_SIZE):
+        yield analysis.to_dict()
+
+def iter_backup_json():
+    """
+    Yield a backup JSON document ({timestamp, data, total_records}), chunk by chunk
+    
+    Records are serialized as they are fetched, so neither the rows nor the
+    document are ever held in memory as a whole. If reading the records fails
+    partway through, the document is closed with an "error" key instead of
+    "total_records" before the exception is re-raised, so a truncated backup
+    is recognisable (and refused by restore_database).
+    
+    Yields:
+        bytes: Consecutive pieces of the JSON document
+    
+    Returns:
+        int: Number of records written (the generator's return value)
+    """
+    yield b'{"timestamp":' + orjson.dumps(datetime.utcnow().isoformat()) + b',"data":['
+    
+    total_records = 0
     try:
-        analyses = CustomerAnalysis.query.all()
-        backup_data = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'total_records': len(analyses),
-            'data': [analysis.to_dict() for analysis in analyses]
-        }
-        return backup_data
+        for record in iter_backup_records():
+            yield (b',\n' if total_records else b'\n') + orjson.dumps(record)
+            total_records += 1
     except Exception as e:
-        print(f"Error creating database backup: {e}")
-        return None
+        print(f"Error creating database backup after {total_records} records: {e}")
+        yield b'\n],"error":' + orjson.dumps(f"Backup incomplete after {total_records} records: {e}") + b'}\n'
+        raise
+    
+    yield b'\n],"total_records":' + orjson.dumps(total_records) + b'}\n'
+    return total_records
+
+def write_backup_json(file):
+    """
+    Stream a backup into a binary file object
+    
+    Args:
+        file: Binary file object the JSON document is written to
+    
+    Returns:
+        int: Number of records written
+    """
+    chunks = iter_backup_json()
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration as done:
+            return done.value
+        file.write(chunk)
+
+def _backup_record_to_row(record):
+    """Map a backup record to column values for INSERT_ANALYSIS"""
+    timestamp = record.get('analysis_timestamp')
+    return {
+        'customer_name': record.get('customer_name'),
+        'meter_number': record.get('meter_number'),
+        'selected_provider': record.get('selected_provider'),
+        'selected_plan': record.get('selected_plan'),
+        'monthly_savings_nis': record.get('monthly_savings_nis'),
+        'monthly_savings_kwh': record.get('monthly_savings_kwh'),
+        'bill_savings_percentage': record.get('bill_savings_percentage'),
+        'active_months_analyzed': record.get('active_months_analyzed'),
+        'filename': record.get('filename'),
+        'ip_address': record.get('ip_address'),
+        'user_agent': record.get('user_agent'),
+        # Preserve original timestamp if available
+        'analysis_timestamp': datetime.fromisoformat(timestamp.replace('Z', '+00:00')) if timestamp else datetime.utcnow()
+    }
 
 def restore_database(backup_data):
     """Restore customer analysis data from backup"""
@@ -186,29 +296,19 @@ def restore_database(backup_data):
         if not backup_data or 'data' not in backup_data:
             return False
         
+        # Backups that failed partway through carry an error instead of the full data
+        if 'error' in backup_data:
+            print(f"Refusing to restore an incomplete backup: {backup_data['error']}")
+            return False
+        
         # Clear existing data
         CustomerAnalysis.query.delete()
         
-        # Restore data
-        for record in backup_data['data']:
-            analysis = CustomerAnalysis(
-                customer_name=record.get('customer_name'),
-                meter_number=record.get('meter_number'),
-                selected_provider=record.get('selected_provider'),
-                selected_plan=record.get('selected_plan'),
-                monthly_savings_nis=record.get('monthly_savings_nis'),
-                monthly_savings_kwh=record.get('monthly_savings_kwh'),
-                bill_savings_percentage=record.get('bill_savings_percentage'),
-                active_months_analyzed=record.get('active_months_analyzed'),
-                filename=record.get('filename'),
-                ip_address=record.get('ip_address'),
-                user_agent=record.get('user_agent')
-            )
-            # Preserve original timestamp if available
-            if record.get('analysis_timestamp'):
-                analysis.analysis_timestamp = datetime.fromisoformat(record['analysis_timestamp'].replace('Z', '+00:00'))
-            
-            db.session.add(analysis)
+        # Restore data in batches of bulk INSERTs, committed together
+        records = backup_data['data']
+        for start in range(0, len(records), RESTORE_BATCH_SIZE):
+            batch = records[start:start + RESTORE_BATCH_SIZE]
+            db.session.execute(INSERT_ANALYSIS, [_backup_record_to_row(record) for record in batch])
         
         db.session.commit()
         print(f"Restored {len(backup_data['data'])} records from backup")
@@ -12,30 +12,177 @@ from datetime import datetime, timedelta
 import calendar
 import sys
 import os
+import tempfile
+from functools import lru_cache
+
+MINUTES_PER_DAY = 24 * 60
+
+DAY_NUMBERS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+HEBREW_DAY_NAMES = {
+    'sunday': 'ראשון',
+    'monday': 'שני', 
+    'tuesday': 'שלישי',
+    'wednesday': 'רביעי',
+    'thursday': 'חמישי',
+    'friday': 'שישי',
+    'saturday': 'שבת'
+}
+
+# Columns (and dtypes) of the enriched consumption data stored in the Parquet cache;
+# the timestamp's resolution is not fixed, so only its kind is checked
+CACHE_DTYPES = {
+    'timestamp': None,
+    'kwh_consumption': np.dtype('float64'),
+    'year_month': pd.PeriodDtype('M'),
+    'weekday': np.dtype('int8'),
+    'hour': np.dtype('int8'),
+    'minute': np.dtype('int8')
+}
+
+# Plans share a handful of day/hour strings, so each distinct string is parsed once
+@lru_cache(maxsize=None)
+def _parse_day_range(day_range):
+    """Parse a day range like "Sunday-Thursday" into a tuple of weekday numbers (0=Monday)."""
+    if '-' in day_range:
+        start_day, end_day = day_range.lower().split('-')
+        start_num = DAY_NUMBERS[start_day]
+        end_num = DAY_NUMBERS[end_day]
+        
+        if start_num <= end_num:
+            return tuple(range(start_num, end_num + 1))
+        else:
+            # Handle wrap-around (e.g., Sunday-Thursday)
+            return tuple(range(start_num, 7)) + tuple(range(0, end_num + 1))
+    else:
+        return (DAY_NUMBERS[day_range.lower()],)
+
+@lru_cache(maxsize=None)
+def _parse_time_range(time_range):
+    """Parse a time range like "23:00-07:00" into (start_hour, start_minute, end_hour, end_minute)."""
+    start_time, end_time = time_range.split('-')
+    start_hour, start_minute = map(int, start_time.split(':'))
+    end_hour, end_minute = map(int, end_time.split(':'))
+    
+    return start_hour, start_minute, end_hour, end_minute
+
+@lru_cache(maxsize=None)
+def _translate_days_to_hebrew(days_str):
+    """Translate an English day range like "Sunday-Thursday" to Hebrew."""
+    if '-' in days_str:
+        start_day, end_day = days_str.lower().split('-')
+        start_hebrew = HEBREW_DAY_NAMES.get(start_day, start_day)
+        end_hebrew = HEBREW_DAY_NAMES.get(end_day, end_day)
+        return f"{start_hebrew}-{end_hebrew}"
+    else:
+        return HEBREW_DAY_NAMES.get(days_str.lower(), days_str)
+
+def _matches_cache_schema(df):
+    """Check that a loaded consumption cache has exactly the columns and dtypes load_data writes."""
+    if list(df.columns) != list(CACHE_DTYPES):
+        return False
+    if not pd.api.types.is_datetime64_dtype(df['timestamp']):
+        return False
+    return all(df[column].dtype == dtype for column, dtype in CACHE_DTYPES.items() if dtype is not None)
+
+def _write_cache(df, cache_file):
+    """Write the consumption cache atomically, so readers never see a partially written file."""
+    # The temporary file lives in the cache's directory so os.replace never crosses filesystems
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(cache_file)}.", suffix='.tmp', dir=os.path.dirname(cache_file) or '.'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            df.to_parquet(file, compression='zstd', index=False)
+        os.replace(temp_path, cache_file)
+    except BaseException:
+        os.remove(temp_path)
+        raise
 
 class PlanRecommender:
-    def __init__(self, consumption_file, plans_file):
+    def __init__(self, consumption_file, plans_file=None, plans_df=None):
         """
         Initialize the plan recommender with consumption and plans data.
         
         Args:
             consumption_file (str): Path to cleaned consumption CSV file
             plans_file (str): Path to electrical plans CSV file
+            plans_df (pd.DataFrame, optional): Already loaded plans data; when
+                given, plans_file is not read
         """
         self.consumption_file = consumption_file
         self.plans_file = plans_file
         self.consumption_data = None
-        self.plans_data = None
+        self.plans_data = plans_df
         self.active_months = []
+        self._active_periods = pd.PeriodIndex([], freq='M')
+        self._consumption_grid = None
+        self._plan_parameters = None
+    
+    @classmethod
+    def from_dataframe(cls, consumption_data, plans_file=None, plans_df=None):
+        """
+        Create a recommender from an already parsed consumption DataFrame.
+        
+        Args:
+            consumption_data (pd.DataFrame): Cleaned consumption data with
+                'timestamp' and 'kwh_consumption' columns
+            plans_file (str): Path to electrical plans CSV file
+            plans_df (pd.DataFrame, optional): Already loaded plans data
+        
+        Returns:
+            PlanRecommender: Recommender that skips reading a consumption file
+        """
+        recommender = cls(None, plans_file, plans_df=plans_df)
+        recommender.consumption_data = consumption_data
+        return recommender
         
     def load_data(self):
-        """Load consumption and plans data from CSV files."""
-        print("Loading consumption data...")
-        self.consumption_data = pd.read_csv(self.consumption_file)
-        self.consumption_data['timestamp'] = pd.to_datetime(self.consumption_data['timestamp'])
+        """Load consumption and plans data from CSV files (or the consumption Parquet cache)."""
+        cache_file = None
+        if self.consumption_file is not None:
+            # Enriched consumption data is cached next to the CSV and reused while it is up to date
+            cache_file = f"{os.fspath(self.consumption_file)}.parquet"
+            cached_data = None
+            if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(self.consumption_file):
+                print("Loading consumption data from cache...")
+                try:
+                    cached_data = pd.read_parquet(cache_file)
+                except (OSError, ValueError) as e:
+                    print(f"Could not read consumption cache: {e}")
+                if cached_data is not None and not _matches_cache_schema(cached_data):
+                    print("Consumption cache does not match the expected schema, rebuilding it...")
+                    cached_data = None
+            if cached_data is not None:
+                self.consumption_data = cached_data
+            else:
+                print("Loading consumption data...")
+                # Arrow's reader parses the ISO timestamps natively, leaving to_datetime a no-op
+                self.consumption_data = pd.read_csv(self.consumption_file, engine='pyarrow')
         
-        print("Loading plans data...")
-        self.plans_data = pd.read_csv(self.plans_file)
+        if 'year_month' not in self.consumption_data:
+            self.consumption_data['timestamp'] = pd.to_datetime(self.consumption_data['timestamp'])
+            
+            # Derive the calendar fields used by the analysis once, instead of per step/plan
+            timestamps = self.consumption_data['timestamp'].dt
+            self.consumption_data['year_month'] = timestamps.to_period('M')
+            self.consumption_data['weekday'] = timestamps.weekday.astype(np.int8)
+            self.consumption_data['hour'] = timestamps.hour.astype(np.int8)
+            self.consumption_data['minute'] = timestamps.minute.astype(np.int8)
+            
+            if cache_file is not None:
+                try:
+                    _write_cache(self.consumption_data, cache_file)
+                except OSError as e:
+                    print(f"Could not write consumption cache: {e}")
+        
+        if self.plans_data is None:
+            print("Loading plans data...")
+            self.plans_data = pd.read_csv(self.plans_file, engine='pyarrow')
+        self._prepare_plans()
         
         print(f"Loaded {len(self.consumption_data)} consumption records")
         print(f"Loaded {len(self.plans_data)} electrical plans")
@@ -52,17 +199,20 @@ class PlanRecommender:
         """
         print(f"Identifying active months with >{max_consumption_threshold*100}% of maximum monthly consumption...")
         
-        # Group by year-month and calculate total consumption per month
-        self.consumption_data['year_month'] = self.consumption_data['timestamp'].dt.to_period('M')
-        monthly_consumption = self.consumption_data.groupby('year_month')['kwh_consumption'].sum()
+        # Calculate total consumption per year-month (months in chronological order)
+        month_codes, months = pd.factorize(self.consumption_data['year_month'], sort=True)
+        monthly_consumption = np.bincount(
+            month_codes, weights=self.consumption_data['kwh_consumption'].to_numpy(dtype=np.float64), minlength=len(months)
+        )
         
         # Find maximum monthly consumption
-        max_monthly_consumption = monthly_consumption.max()
+        max_monthly_consumption = monthly_consumption.max() if len(monthly_consumption) else np.nan
         min_consumption_threshold = max_monthly_consumption * max_consumption_threshold
         
         active_months = []
+        month_lines = []  # Printed in one write once all months are classified
         
-        for period, consumption in monthly_consumption.items():
+        for period, consumption in zip(months, monthly_consumption):
             year = period.year
             month = period.month
             
@@ -70,11 +220,16 @@ class PlanRecommender:
             
             if consumption >= min_consumption_threshold:
                 active_months.append((year, month))
-                print(f"  {period}: {consumption:.2f} kWh ({consumption_percentage:.1%} of max) - ACTIVE")
+                month_lines.append(f"  {period}: {consumption:.2f} kWh ({consumption_percentage:.1%} of max) - ACTIVE")
             else:
-                print(f"  {period}: {consumption:.2f} kWh ({consumption_percentage:.1%} of max) - SKIPPED (low consumption)")
+                month_lines.append(f"  {period}: {consumption:.2f} kWh ({consumption_percentage:.1%} of max) - SKIPPED (low consumption)")
+        
+        if month_lines:
+            print("\n".join(month_lines))
         
         self.active_months = active_months
+        self._active_periods = pd.PeriodIndex([pd.Period(year=year, month=month, freq='M') for year, month in active_months], freq='M')
+        self._consumption_grid = None  # Derived from the active months, rebuilt on next use
         print(f"Found {len(active_months)} active months")
         print(f"Maximum monthly consumption: {max_monthly_consumption:.2f} kWh")
         print(f"Minimum threshold: {min_consumption_threshold:.2f} kWh")
@@ -90,23 +245,7 @@ class PlanRecommender:
         Returns:
             list: List of weekday numbers (0=Monday, 6=Sunday)
         """
-        day_mapping = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-            'friday': 4, 'saturday': 5, 'sunday': 6
-        }
-        
-        if '-' in day_range:
-            start_day, end_day = day_range.lower().split('-')
-            start_num = day_mapping[start_day]
-            end_num = day_mapping[end_day]
-            
-            if start_num <= end_num:
-                return list(range(start_num, end_num + 1))
-            else:
-                # Handle wrap-around (e.g., Sunday-Thursday)
-                return list(range(start_num, 7)) + list(range(0, end_num + 1))
-        else:
-            return [day_mapping[day_range.lower()]]
+        return list(_parse_day_range(day_range))
     
     def parse_time_range(self, time_range):
         """
@@ -118,11 +257,7 @@ class PlanRecommender:
         Returns:
             tuple: (start_hour, start_minute, end_hour, end_minute)
         """
-        start_time, end_time = time_range.split('-')
-        start_hour, start_minute = map(int, start_time.split(':'))
-        end_hour, end_minute = map(int, end_time.split(':'))
-        
-        return start_hour, start_minute, end_hour, end_minute
+        return _parse_time_range(time_range)
     
     def translate_days_to_hebrew(self, days_str):
         """
@@ -134,23 +269,7 @@ class PlanRecommender:
         Returns:
             str: Hebrew translation
         """
-        day_translations = {
-            'sunday': 'ראשון',
-            'monday': 'שני', 
-            'tuesday': 'שלישי',
-            'wednesday': 'רביעי',
-            'thursday': 'חמישי',
-            'friday': 'שישי',
-            'saturday': 'שבת'
-        }
-        
-        if '-' in days_str:
-            start_day, end_day = days_str.lower().split('-')
-            start_hebrew = day_translations.get(start_day, start_day)
-            end_hebrew = day_translations.get(end_day, end_day)
-            return f"{start_hebrew}-{end_hebrew}"
-        else:
-            return day_translations.get(days_str.lower(), days_str)
+        return _translate_days_to_hebrew(days_str)
     
     def format_time_range_hebrew(self, time_str):
         """
@@ -166,67 +285,87 @@ class PlanRecommender:
             return "24/7"
         return time_str
     
-    def calculate_plan_savings(self, plan):
+    def _prepare_active_frame(self):
+        """Filter consumption to the active months once and bin it by weekday and minute of the day."""
+        # Only the needed columns are pulled out as arrays, instead of copying a filtered frame
+        data = self.consumption_data
+        mask = np.isin(data['year_month'].array.asi8, self._active_periods.asi8)  # Compare month ordinals, not Period objects
+        kwh = data['kwh_consumption'].to_numpy(dtype=np.float64)[mask]
+        minute_of_week = (
+            data['weekday'].to_numpy(dtype=np.int16) * MINUTES_PER_DAY +
+            data['hour'].to_numpy(dtype=np.int16) * 60 +
+            data['minute'].to_numpy(dtype=np.int16)
+        )[mask]
+        
+        # Plan eligibility depends only on weekday and time of day, so every plan is
+        # evaluated against this 7 x 1440 grid instead of the individual records
+        self._consumption_grid = np.bincount(
+            minute_of_week, weights=kwh, minlength=7 * MINUTES_PER_DAY
+        ).reshape(7, MINUTES_PER_DAY)
+        self._num_active_records = len(kwh)
+        self._total_consumption = float(kwh.sum())
+    
+    def _parse_plans(self, plans):
         """
-        Calculate potential monthly savings for a specific plan.
+        Parse plan days, hours and discounts into per-plan arrays.
         
         Args:
-            plan (pd.Series): Plan data from plans DataFrame
+            plans (pd.DataFrame): Plans in the plans CSV format
         
         Returns:
-            dict: Savings calculation results
+            tuple: (day_lookup, start_minutes, end_minutes, overnight, discount_percentage)
         """
-        # Parse plan parameters
-        applicable_days = self.parse_day_range(plan['week_days_applicable'])
-        start_hour, start_minute, end_hour, end_minute = self.parse_time_range(plan['hours_applicable'])
-        discount_percentage = plan['price_percentage_off'] / 100
-        
-        # Filter consumption data for active months only
-        active_consumption = self.consumption_data[
-            self.consumption_data['year_month'].apply(
-                lambda x: (x.year, x.month) in self.active_months
-            )
-        ].copy()
+        num_plans = len(plans)
+        day_lookup = np.zeros((num_plans, 7), dtype=bool)
+        start_minutes = np.empty(num_plans, dtype=np.int16)
+        end_minutes = np.empty(num_plans, dtype=np.int16)
+        overnight = np.empty(num_plans, dtype=bool)
+        for i, (days, hours) in enumerate(zip(plans['week_days_applicable'], plans['hours_applicable'])):
+            day_lookup[i, self.parse_day_range(days)] = True
+            start_hour, start_minute, end_hour, end_minute = self.parse_time_range(hours)
+            start_minutes[i] = start_hour * 60 + start_minute
+            end_minutes[i] = end_hour * 60 + end_minute
+            overnight[i] = start_hour > end_hour  # e.g. 23:00-07:00
+        discount_percentage = plans['price_percentage_off'].to_numpy(dtype=np.float64) / 100
+        
+        return day_lookup, start_minutes, end_minutes, overnight, discount_percentage
+    
+    def _prepare_plans(self):
+        """Parse the loaded plans once so every recommendation run reuses their arrays."""
+        self._plan_parameters = self._parse_plans(self.plans_data)
+    
+    def calculate_savings(self, plans=None):
+        """
+        Calculate potential monthly savings for all given plans in one batch.
         
-        if len(active_consumption) == 0:
-            return {
-                'total_consumption': 0,
-                'discounted_consumption': 0,
-                'monthly_savings': 0,
-                'applicable_consumption_percentage': 0
-            }
+        Args:
+            plans (pd.DataFrame, optional): Plans to evaluate, in the plans CSV format
+                (defaults to the loaded plans, parsed once by load_data)
+        
+        Returns:
+            dict: Savings calculation results, each value an array with one entry per plan
+        """
+        if self._consumption_grid is None:
+            self._prepare_active_frame()
         
-        # Add day of week and time information
-        active_consumption['weekday'] = active_consumption['timestamp'].dt.weekday
-        active_consumption['hour'] = active_consumption['timestamp'].dt.hour
-        active_consumption['minute'] = active_consumption['timestamp'].dt.minute
-        
-        # Determine which consumption records are eligible for discount
-        day_eligible = active_consumption['weekday'].isin(applicable_days)
-        
-        # Handle time eligibility (including overnight periods)
-        if start_hour <= end_hour:
-            # Same day time range (e.g., 07:00-17:00)
-            time_eligible = (
-                (active_consumption['hour'] > start_hour) |
-                ((active_consumption['hour'] == start_hour) & (active_consumption['minute'] >= start_minute))
-            ) & (
-                (active_consumption['hour'] < end_hour) |
-                ((active_consumption['hour'] == end_hour) & (active_consumption['minute'] < end_minute))
-            )
+        if plans is None:
+            if self._plan_parameters is None:
+                self._prepare_plans()
+            plan_parameters = self._plan_parameters
         else:
-            # Overnight time range (e.g., 23:00-07:00)
-            time_eligible = (
-                (active_consumption['hour'] > start_hour) |
-                ((active_consumption['hour'] == start_hour) & (active_consumption['minute'] >= start_minute)) |
-                (active_consumption['hour'] < end_hour) |
-                ((active_consumption['hour'] == end_hour) & (active_consumption['minute'] < end_minute))
-            )
-        
-        # Consumption eligible for discount
-        eligible_mask = day_eligible & time_eligible
-        discounted_consumption = active_consumption.loc[eligible_mask, 'kwh_consumption'].sum()
-        total_consumption = active_consumption['kwh_consumption'].sum()
+            plan_parameters = self._parse_plans(plans)
+        day_lookup, start_minutes, end_minutes, overnight, discount_percentage = plan_parameters
+        num_plans = len(discount_percentage)
+        
+        # Eligibility of every minute of the day for every plan (plans x minutes)
+        minutes = np.arange(MINUTES_PER_DAY)
+        after_start = minutes >= start_minutes[:, None]
+        before_end = minutes < end_minutes[:, None]
+        time_eligible = np.where(overnight[:, None], after_start | before_end, after_start & before_end)
+        
+        # Consumption eligible for discount, per plan: the plan's days of the grid, summed over its hours
+        discounted_consumption = ((day_lookup @ self._consumption_grid) * time_eligible).sum(axis=1)
+        total_consumption = self._total_consumption
         
         # Calculate savings (assuming base rate of 1 unit per kWh for calculation purposes)
         # In real implementation, you'd multiply by actual electricity rate
@@ -236,25 +375,49 @@ class PlanRecommender:
         
         # Calculate monthly average savings
         num_months = len(self.active_months)
-        monthly_savings = total_savings / num_months if num_months > 0 else 0
+        monthly_savings = total_savings / num_months if num_months > 0 else np.zeros(num_plans)
         monthly_consumption = total_consumption / num_months if num_months > 0 else 0
         
         # Calculate percentage of total bill saved
-        bill_savings_percentage = (monthly_savings / monthly_consumption * 100) if monthly_consumption > 0 else 0
+        bill_savings_percentage = (monthly_savings / monthly_consumption * 100) if monthly_consumption > 0 else np.zeros(num_plans)
         
-        applicable_percentage = (discounted_consumption / total_consumption * 100) if total_consumption > 0 else 0
+        applicable_percentage = (discounted_consumption / total_consumption * 100) if total_consumption > 0 else np.zeros(num_plans)
         
         return {
-            'total_consumption': total_consumption,
+            'total_consumption': np.full(num_plans, total_consumption),
             'discounted_consumption': discounted_consumption,
             'monthly_savings': monthly_savings,
-            'monthly_consumption': monthly_consumption,
+            'monthly_consumption': np.full(num_plans, monthly_consumption),
             'bill_savings_percentage': bill_savings_percentage,
             'applicable_consumption_percentage': applicable_percentage,
             'total_savings': total_savings,
-            'num_active_months': num_months
+            'num_active_months': np.full(num_plans, num_months)
         }
     
+    def calculate_plan_savings(self, plan):
+        """
+        Calculate potential monthly savings for a specific plan.
+        
+        Args:
+            plan (pd.Series): Plan data from plans DataFrame
+        
+        Returns:
+            dict: Savings calculation results
+        """
+        if self._consumption_grid is None:
+            self._prepare_active_frame()
+        
+        if self._num_active_records == 0:
+            return {
+                'total_consumption': 0,
+                'discounted_consumption': 0,
+                'monthly_savings': 0,
+                'applicable_consumption_percentage': 0
+            }
+        
+        savings = self.calculate_savings(plan.to_frame().T)
+        return {key: values[0] for key, values in savings.items()}
+    
     def generate_recommendations(self):
         """
         Generate plan recommendations sorted by monthly savings.
@@ -270,12 +433,21 @@ class PlanRecommender:
         
         print("Calculating savings for each plan...")
         
+        self._prepare_active_frame()
+        if len(self.plans_data):
+            print("\n".join(f"  Analyzing plan: {plan_name}" for plan_name in self.plans_data['plan_name']))
+        
+        savings = self.calculate_savings()
+        
+        # Display strings for all plans at once (same results as translate_days_to_hebrew / format_time_range_hebrew)
+        applicable_days = self.plans_data['week_days_applicable'].map(_translate_days_to_hebrew).to_numpy()
+        hours = self.plans_data['hours_applicable']
+        applicable_hours = hours.where(hours != "00:00-23:59", "24/7").to_numpy()
+        
         recommendations = []
         
-        for idx, plan in self.plans_data.iterrows():
-            print(f"  Analyzing plan: {plan['plan_name']}")
-            
-            savings_data = self.calculate_plan_savings(plan)
+        for i, (idx, plan) in enumerate(self.plans_data.iterrows()):
+            savings_data = {key: values[i] for key, values in savings.items()}
             
             # Calculate monthly savings in NIS (0.5425 NIS per kWh * 1.18 for tax savings)
             monthly_savings_nis = round(savings_data['monthly_savings'] * 0.5425 * 1.18, 2)
@@ -283,8 +455,8 @@ class PlanRecommender:
             recommendation = {
                 'provider': plan['provider'],
                 'plan_name': plan['plan_name'],
-                'applicable_days': self.translate_days_to_hebrew(plan['week_days_applicable']),
-                'applicable_hours': self.format_time_range_hebrew(plan['hours_applicable']),
+                'applicable_days': applicable_days[i],
+                'applicable_hours': applicable_hours[i],
                 'discount_percentage': plan['price_percentage_off'],
                 'monthly_savings_kwh': round(savings_data['monthly_savings'], 2),
                 'monthly_savings_nis': monthly_savings_nis,
@@ -318,50 +490,24 @@ class PlanRecommender:
         sorted_active_months = sorted(self.active_months, reverse=True)[:6]
         
         # Filter consumption data for these months
-        active_consumption = self.consumption_data[
-            self.consumption_data['year_month'].apply(
-                lambda x: (x.year, x.month) in sorted_active_months
-            )
-        ].copy()
+        periods = pd.PeriodIndex([pd.Period(year=year, month=month, freq='M') for year, month in sorted_active_months], freq='M')
+        mask = np.isin(self.consumption_data['year_month'].array.asi8, periods.asi8)
+        active_consumption = self.consumption_data.loc[mask, ['year_month', 'hour', 'kwh_consumption']]
         
         if len(active_consumption) == 0:
             return {}
         
-        # Add hour column
-        active_consumption['hour'] = active_consumption['timestamp'].dt.hour
-        active_consumption['month_name'] = active_consumption['timestamp'].dt.strftime('%Y-%m')
+        # Average consumption per (month, hour) in one grouping, with all 24 hours per month
+        hourly_avg = active_consumption.groupby(
+            ['year_month', 'hour']
+        )['kwh_consumption'].mean().unstack(fill_value=0.0).reindex(columns=range(24), fill_value=0.0).round(3)
         
-        # Group by month and hour, calculate average consumption
-        hourly_data = {}
-        
-        # Calculate data for each month
-        for year, month in sorted_active_months:
-            month_data = active_consumption[
-                (active_consumption['timestamp'].dt.year == year) & 
-                (active_consumption['timestamp'].dt.month == month)
-            ]
-            
-            if len(month_data) > 0:
-                month_name = f"{year}-{month:02d}"
-                hourly_avg = month_data.groupby('hour')['kwh_consumption'].mean()
-                
-                # Ensure we have data for all 24 hours
-                hourly_consumption = []
-                for hour in range(24):
-                    avg_consumption = hourly_avg.get(hour, 0)
-                    hourly_consumption.append(round(avg_consumption, 3))
-                
-                hourly_data[month_name] = hourly_consumption
+        # Most recent month first, as in sorted_active_months
+        hourly_avg = hourly_avg.reindex([period for period in periods if period in hourly_avg.index])
+        hourly_data = {str(period): values for period, values in zip(hourly_avg.index, hourly_avg.values.tolist())}
         
         # Calculate overall average across all active months
-        if hourly_data:
-            all_hours_data = []
-            for hour in range(24):
-                hour_values = [month_data[hour] for month_data in hourly_data.values() if len(month_data) > hour]
-                avg_for_hour = sum(hour_values) / len(hour_values) if hour_values else 0
-                all_hours_data.append(round(avg_for_hour, 3))
-            
-            hourly_data['average'] = all_hours_data
+        hourly_data['average'] = hourly_avg.mean(axis=0).round(3).tolist()
         
         return hourly_data
     
@@ -379,11 +525,23 @@ class PlanRecommender:
         print(f"{'Rank':<4} {'Provider':<15} {'Plan Name':<20} {'Days':<15} {'Hours':<12} {'Discount':<8} {'Monthly Savings':<15} {'Bill Savings':<12} {'Coverage':<10}")
         print("-" * 140)
         
-        for idx, row in recommendations_df.iterrows():
-            rank = recommendations_df.index.get_loc(idx) + 1
-            print(f"{rank:<4} {row['provider']:<15} {row['plan_name']:<20} {row['applicable_days']:<15} "
-                  f"{row['applicable_hours']:<12} {row['discount_percentage']:<7}% "
-                  f"{row['monthly_savings_kwh']:<14.2f} {row['bill_savings_percentage']:<11.1f}% {row['applicable_consumption_pct']:<9.1f}%")
+        # Format all rows in one call; each formatter pads its column like the header above
+        table_df = recommendations_df[[
+            'provider', 'plan_name', 'applicable_days', 'applicable_hours', 'discount_percentage',
+            'monthly_savings_kwh', 'bill_savings_percentage', 'applicable_consumption_pct'
+        ]]
+        table_df.insert(0, 'rank', range(1, len(table_df) + 1))
+        print(table_df.to_string(index=False, header=False, formatters={
+            'rank': '{:<4}'.format,
+            'provider': '{:<15}'.format,
+            'plan_name': '{:<20}'.format,
+            'applicable_days': '{:<15}'.format,
+            'applicable_hours': '{:<12}'.format,
+            'discount_percentage': '{:<7}%'.format,
+            'monthly_savings_kwh': '{:<14.2f}'.format,
+            'bill_savings_percentage': '{:<11.1f}%'.format,
+            'applicable_consumption_pct': '{:<9.1f}%'.format
+        }))
         
         print("-" * 140)
         print(f"Analysis based on {recommendations_df.iloc[0]['active_months_analyzed']} active months")
@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from consumption_parser import parse_consumption_file
+
+HEADER = '"תאריך","מועד תחילת הפעימה","צריכה בקוט""ש"\n\n'
+
+
+def _parse(rows):
+    return parse_consumption_file(io.BytesIO((HEADER + '\n'.join(rows) + '\n').encode('utf-8')))
+
+
+class RaggedRowsTest(unittest.TestCase):
+    """Rows with at least three fields are kept whatever the first data row looks like."""
+    
+    def test_extra_fields_are_kept(self):
+        df = _parse([
+            '"20/10/2024","00:00","0.500"',
+            '"20/10/2024","00:15","1.5",',
+            '"20/10/2024","00:30","2.5","extra"',
+            '"20/10/2024","00:45","3",,'
+        ])
+        self.assertEqual(df['kwh_consumption'].tolist(), [0.5, 1.5, 2.5, 3.0])
+    
+    def test_short_first_row_is_skipped(self):
+        df = _parse([
+            '"20/10/2024","00:00"',
+            '"20/10/2024","00:15","1.5"',
+            '"20/10/2024","00:30","2.5",',
+            '"20/10/2024","00:45"'
+        ])
+        self.assertEqual(df['timestamp'].dt.strftime('%H:%M').tolist(), ['00:15', '00:30'])
+        self.assertEqual(df['kwh_consumption'].tolist(), [1.5, 2.5])
+    
+    def test_trailing_comma_on_every_row(self):
+        df = _parse([
+            '"21/10/2024","01:00","0.250",',
+            '"20/10/2024","01:00","",'
+        ])
+        self.assertEqual(df['kwh_consumption'].tolist(), [0.0, 0.25])
+
+
+if __name__ == '__main__':
+    unittest.main()